@@ -18,9 +18,14 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import hashlib
 import io
+import math
 import os
-from collections import namedtuple
+import re
+import threading
+from collections import OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import cairocffi
 import cairocffi.pixbuf
@@ -34,6 +39,38 @@ class LoadingError(Exception):
 
 _SurfaceInfo = namedtuple("_SurfaceInfo", ("surface", "file_type"))
 
+# Images of these types are rendered at the requested size rather than scaled
+_VECTOR_FILE_TYPES = frozenset({"svg"})
+
+# Byte orders accepted by Img.from_raw. Cairo stores pixels as native endian
+# 32 bit words so on little endian machines these are BGRA/BGRX in memory.
+_RAW_FORMATS = {
+    "BGRA": cairocffi.FORMAT_ARGB32,
+    "BGRX": cairocffi.FORMAT_RGB24,
+}
+
+# Rotations smaller than this (in degrees) are treated as no rotation
+_EPS = 1.0e-6
+
+# Looked up once rather than on every pattern built
+_SurfacePattern = cairocffi.SurfacePattern
+_Matrix = cairocffi.Matrix
+_FILTER_BEST = cairocffi.FILTER_BEST
+
+# Filters accepted by Img.set_interim_filter
+_FILTERS = {
+    "fast": cairocffi.FILTER_FAST,
+    "good": cairocffi.FILTER_GOOD,
+    "best": _FILTER_BEST,
+    "nearest": cairocffi.FILTER_NEAREST,
+    "bilinear": cairocffi.FILTER_BILINEAR,
+}
+
+# Maximum number of threads Loader uses to decode images at once
+_MAX_LOADER_THREADS = 8
+
+_GLOB_MAGIC = re.compile("[*?[]")
+
 
 def _decode_to_image_surface(bytes_img, width=None, height=None):
     try:
@@ -60,17 +97,108 @@ def get_cairo_surface(bytes_img, width=None, height=None):
     return _decode_to_image_surface(bytes_img, width, height)
 
 
-def get_cairo_pattern(surface, width=None, height=None, theta=0.0):
+def _read_file(image_path):
+    """Read the whole of image_path with a single unbuffered read.
+
+    The decoded image is cached, so the kernel is told it may drop the file's
+    pages rather than keep them around in the page cache.
+    """
+    fd = os.open(image_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return data
+
+
+class _DecodeCache:
+    """LRU cache of decoded images bounded by their total size in bytes.
+
+    Surfaces larger than max_entry bytes (wallpapers rather than icons) are
+    never kept, so loading one doesn't push every cached icon out.
+    """
+
+    def __init__(self, max_bytes, max_entry):
+        self.max_bytes = max_bytes
+        self.max_entry = max_entry
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes):
+        if nbytes > self.max_entry:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._size += nbytes
+            while self._size > self.max_bytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                self._size -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_decode_cache = _DecodeCache(max_bytes=16 * 1024 * 1024, max_entry=1024 * 1024)
+
+
+def _decode_path(image_path, mtime):
+    """Read and decode the image at image_path.
+
+    Results are cached on (image_path, mtime) so repeated loads of the same
+    icon skip both the file read and the decode. The returned surface is
+    shared between Img instances and must not be drawn on or finished.
+
+    The file's contents are only returned for vector images, which need them
+    to render at other sizes, so the cache doesn't hold on to raster data.
+    """
+    key = (image_path, mtime)
+    cached = _decode_cache.get(key)
+    if cached is not None:
+        return cached
+    bytes_img = _read_file(image_path)
+    surf, fmt = get_cairo_surface(bytes_img)
+    if fmt not in _VECTOR_FILE_TYPES:
+        bytes_img = None
+    result = bytes_img, surf, fmt
+    nbytes = surf.get_stride() * surf.get_height() + len(bytes_img or b"")
+    _decode_cache.put(key, result, nbytes)
+    return result
+
+
+def get_cairo_pattern(surface, width=None, height=None, theta=0.0, filter=_FILTER_BEST):
     """Return a SurfacePattern from an ImageSurface.
 
     if width and height are not None scale the pattern
     to be size width and height.
 
     theta is in degrees ccw
+
+    filter is the cairo filter used when the pattern is scaled
     """
-    pattern = cairocffi.SurfacePattern(surface)
-    pattern.set_filter(cairocffi.FILTER_BEST)
-    matrix = cairocffi.Matrix()
+    pattern = _SurfacePattern(surface)
+    pattern.set_filter(filter)
 
     tr_width, tr_height = 1.0, 1.0
     surf_width, surf_height = surface.get_width(), surface.get_height()
@@ -78,81 +206,67 @@ def get_cairo_pattern(surface, width=None, height=None, theta=0.0):
         tr_width = surf_width / width
     if (height is not None) and (height != surf_height):
         tr_height = surf_height / height
-    matrix.scale(tr_width, tr_height)
-
-    epsilon = 1.0e-6
-    pi = 3.141592653589793
-    if abs(theta) > epsilon:
-        theta_rad = pi / 180.0 * theta
-        mat_rot = cairocffi.Matrix()
-        # https://cairographics.org/cookbook/transform_about_point/
-        xt = surf_width * tr_width * 0.5
-        yt = surf_height * tr_height * 0.5
-        mat_rot.translate(xt, yt)
-        mat_rot.rotate(theta_rad)
-        mat_rot.translate(-xt, -yt)
-        matrix = mat_rot.multiply(matrix)
 
+    if abs(theta) <= _EPS:
+        if tr_width != 1.0 or tr_height != 1.0:
+            pattern.set_matrix(_Matrix(xx=tr_width, yy=tr_height))
+        return pattern
+
+    # Rotate about the centre of the scaled pattern, then scale, i.e.
+    # scale * translate(xt, yt) * rotate * translate(-xt, -yt). See
+    # https://cairographics.org/cookbook/transform_about_point/
+    # The product is written out here rather than built up from Matrix calls.
+    theta_rad = math.radians(theta)
+    cos, sin = math.cos(theta_rad), math.sin(theta_rad)
+    xt = surf_width * tr_width * 0.5
+    yt = surf_height * tr_height * 0.5
+    matrix = _Matrix(
+        xx=cos * tr_width,
+        yx=sin * tr_height,
+        xy=-sin * tr_width,
+        yy=cos * tr_height,
+        x0=tr_width * (xt - cos * xt + sin * yt),
+        y0=tr_height * (yt - sin * xt - cos * yt),
+    )
     pattern.set_matrix(matrix)
     return pattern
 
 
-class _Descriptor:
-    def __init__(self, name=None, default=None, **opts):
-        self.name = name
-        self.under_name = "_" + name
-        self.default = default
-        for key, value in opts.items():
-            setattr(self, key, value)
-
-    def __get__(self, obj, cls):
-        if obj is None:
-            return self
-        _getattr = getattr
-        try:
-            return _getattr(obj, self.under_name)
-        except AttributeError:
-            return self.get_default(obj)
-
-    def get_default(self, obj):
-        return self.default
-
-    def __set__(self, obj, value):
-        setattr(obj, self.under_name, value)
-
-    def __delete__(self, obj):
-        delattr(obj, self.under_name)
-
-
-class _Resetter(_Descriptor):
-    def __set__(self, obj, value):
-        super().__set__(obj, value)
-        obj._reset()
-
-
-class _PixelSize(_Resetter):
-    def __set__(self, obj, value):
-        value = max(round(value), 1)
-        super().__set__(obj, value)
-
-    def get_default(self, obj):
-        size = obj.default_size
-        return getattr(size, self.name)
+_ImgSize = namedtuple("_ImgSize", ("width", "height"))
 
 
-class _Rotation(_Resetter):
-    def __set__(self, obj, value):
-        value = float(value)
-        super().__set__(obj, value)
+def _scale_lock(width0, height0, width_factor, height_factor):
+    if width_factor and height_factor:
+        raise ValueError(
+            "Can't rescale with locked aspect ratio "
+            "and give width_factor and height_factor."
+            " {}, {}".format(width_factor, height_factor)
+        )
+    if width_factor:
+        width = width0 * width_factor
+        return width, height0 / width0 * width
+    height = height0 * height_factor
+    return width0 / height0 * height, height
 
 
-_ImgSize = namedtuple("_ImgSize", ("width", "height"))
+def _scale_free(width0, height0, width_factor, height_factor):
+    if width_factor is None:
+        width_factor = 1
+    if height_factor is None:
+        height_factor = 1
+    return width0 * width_factor, height0 * height_factor
 
 
 class Img:
     """Img is a class which creates & manipulates cairo SurfacePatterns from an image
 
-    There are two constructors Img(...) and Img.from_path(...)
+    Instances are created with Img.from_path(...), Img.from_bytes(...) or
+    Img.from_raw(...). Passing the encoded image to Img(...) directly is still
+    supported for backwards compatibility but from_bytes should be preferred.
+
+    Only vector images keep their encoded bytes (in bytes_img), which are needed
+    to render them at other sizes. Raster images are decoded once and only the
+    surface is kept.
 
     The cairo surface pattern is at img.pattern.
     Changing any of the attributes width, height, or theta will update the pattern.
@@ -163,50 +277,173 @@ class Img:
     Pattern is first stretched, then rotated.
     """
 
-    def __init__(self, bytes_img, name="", path=""):
+    __slots__ = (
+        "bytes_img",
+        "name",
+        "path",
+        "_width",
+        "_height",
+        "_theta",
+        "_surface",
+        "_pattern_cache",
+        "_default_surface",
+        "_default_size",
+        "_file_type",
+        "_surface_digest",
+        "_filter",
+    )
+
+    # Number of patterns kept per instance, so toggling between a few sizes
+    # (e.g. hover states) doesn't rebuild the pattern every time.
+    _PATTERN_CACHE_SIZE = 8
+
+    def __init__(self, bytes_img=None, name="", path="", surface=None, file_type=None):
         self.bytes_img = bytes_img
         self.name = name
         self.path = path
-
-    def _reset(self):
-        attrs = ("surface", "pattern")
-        for attr in attrs:
-            try:
-                delattr(self, attr)
-            except AttributeError:
-                pass
+        self._width = None
+        self._height = None
+        self._theta = 0.0
+        self._surface = None
+        self._pattern_cache = OrderedDict()
+        self._default_surface = surface
+        self._default_size = None
+        self._file_type = file_type
+        self._surface_digest = None
+        self._filter = _FILTER_BEST
+
+    def _invalidate(self):
+        # Patterns are cached by size and rotation so only the surface of a
+        # vector image, which is rendered at the current size, needs to go.
+        # It isn't finished as cached patterns may still be using it.
+        self._surface = None
 
     @classmethod
     def from_path(cls, image_path):
         "Create an Img instance from image_path"
-        with open(image_path, "rb") as fobj:
-            bytes_img = fobj.read()
+        mtime = os.stat(image_path).st_mtime_ns
+        bytes_img, surf, fmt = _decode_path(image_path, mtime)
         name = os.path.basename(image_path)
         name, file_type = os.path.splitext(name)
-        return cls(bytes_img, name=name, path=image_path)
+        return cls(bytes_img, name=name, path=image_path, surface=surf, file_type=fmt)
+
+    @classmethod
+    def from_bytes(cls, bytes_img, name="", path=""):
+        "Create an Img instance from an encoded image"
+        surf, fmt = get_cairo_surface(bytes_img)
+        if fmt not in _VECTOR_FILE_TYPES:
+            bytes_img = None
+        return cls(bytes_img, name=name, path=path, surface=surf, file_type=fmt)
+
+    @classmethod
+    def from_raw(cls, buf, width, height, stride=None, fmt="BGRA", name=""):
+        """Create an Img instance from raw 32 bit pixel data
+
+        buf holds height rows of stride bytes in one of the formats in
+        _RAW_FORMATS; nothing is decoded. If buf is writable and its stride is
+        the one cairo uses the surface is created directly on top of it,
+        otherwise the pixels are copied into a new buffer first.
+        """
+        try:
+            cairo_fmt = _RAW_FORMATS[fmt]
+        except KeyError:
+            raise ValueError("Unsupported raw image format: {}".format(fmt))
+
+        row = width * 4
+        cairo_stride = cairocffi.ImageSurface.format_stride_for_width(cairo_fmt, width)
+        if stride is None:
+            stride = cairo_stride
+        view = memoryview(buf).cast("B")
+        if stride < row or len(view) < stride * (height - 1) + row:
+            raise ValueError("Buffer is too small for a {}x{} image".format(width, height))
+
+        if stride != cairo_stride:
+            data = bytearray(cairo_stride * height)
+            for y in range(height):
+                src, dst = y * stride, y * cairo_stride
+                data[dst : dst + row] = view[src : src + row]
+            view = memoryview(data)
+        elif view.readonly:
+            view = memoryview(bytearray(view[: cairo_stride * height]))
+
+        surf = cairocffi.ImageSurface.create_for_data(
+            view, cairo_fmt, width, height, cairo_stride
+        )
+        return cls(name=name, surface=surf, file_type="raw")
 
     @property
     def default_surface(self):
-        try:
-            return self._default_surface
-        except AttributeError:
+        """The image decoded at its own size
+
+        Images loaded with from_path share this surface with other Img
+        instances for the same file, so it must be treated as read-only:
+        don't draw on it, flush changes into it or finish it.
+        """
+        if self._default_surface is None:
             surf, fmt = get_cairo_surface(self.bytes_img)
             self._default_surface = surf
-            return surf
+            self._file_type = fmt
+            if fmt not in _VECTOR_FILE_TYPES:
+                self.bytes_img = None
+        return self._default_surface
 
     @property
     def default_size(self):
-        try:
-            return self._default_size
-        except AttributeError:
+        if self._default_size is None:
             surf = self.default_surface
-            size = _ImgSize(surf.get_width(), surf.get_height())
-            self._default_size = size
-            return size
+            self._default_size = _ImgSize(surf.get_width(), surf.get_height())
+        return self._default_size
+
+    @property
+    def theta(self):
+        return self._theta
+
+    @theta.setter
+    def theta(self, value):
+        self._theta = float(value)
+
+    @theta.deleter
+    def theta(self):
+        self._theta = 0.0
+
+    @property
+    def width(self):
+        if self._width is None:
+            return self.default_size.width
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        # Sizes usually arrive as positive ints, which can be stored as they are
+        if type(value) is not int or value < 1:
+            value = max(round(value), 1)
+        if value != self._width:
+            self._width = value
+            self._invalidate()
+
+    @width.deleter
+    def width(self):
+        self._width = None
+        self._invalidate()
 
-    theta = _Rotation("theta", default=0.0)
-    width = _PixelSize("width")
-    height = _PixelSize("height")
+    @property
+    def height(self):
+        if self._height is None:
+            return self.default_size.height
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        if type(value) is not int or value < 1:
+            value = max(round(value), 1)
+        if value != self._height:
+            self._height = value
+            self._invalidate()
+
+    @height.deleter
+    def height(self):
+        self._height = None
+        self._invalidate()
 
     def resize(self, width=None, height=None):
         width0, height0 = self.default_size
@@ -225,67 +462,70 @@ class Img:
     def scale(self, width_factor=None, height_factor=None, lock_aspect_ratio=False):
         if not (width_factor or height_factor):
             raise ValueError("You must supply width_factor or height_factor")
+        width0, height0 = self.default_size
         if lock_aspect_ratio:
-            res = self._scale_lock(width_factor, height_factor, self.default_size)
+            res = _scale_lock(width0, height0, width_factor, height_factor)
         else:
-            res = self._scale_free(width_factor, height_factor, self.default_size)
+            res = _scale_free(width0, height0, width_factor, height_factor)
         self.width, self.height = res
 
-    @staticmethod
-    def _scale_lock(width_factor, height_factor, initial_size):
-        if width_factor and height_factor:
-            raise ValueError(
-                "Can't rescale with locked aspect ratio "
-                "and give width_factor and height_factor."
-                " {}, {}".format(width_factor, height_factor)
-            )
-        width0, height0 = initial_size
-        if width_factor:
-            width = width0 * width_factor
-            height = height0 / width0 * width
-        else:
-            height = height0 * height_factor
-            width = width0 / height0 * height
-        return _ImgSize(width, height)
-
-    @staticmethod
-    def _scale_free(width_factor, height_factor, initial_size):
-        width_factor = 1 if width_factor is None else width_factor
-        height_factor = 1 if height_factor is None else height_factor
-        width0, height0 = initial_size
-        return _ImgSize(width0 * width_factor, height0 * height_factor)
-
     @property
     def surface(self):
-        try:
-            return self._surface
-        except AttributeError:
+        """The surface patterns are built from
+
+        Raster images always use the decoded default surface and are scaled by
+        the pattern matrix. Vector images are rendered again at the current
+        size so they stay sharp. For raster images this is default_surface,
+        which may be shared, so it is read-only too.
+        """
+        default_surface = self.default_surface
+        if self._file_type not in _VECTOR_FILE_TYPES:
+            return default_surface
+        if self._surface is None:
             surf, fmt = get_cairo_surface(self.bytes_img, self.width, self.height)
             self._surface = surf
-            return surf
+        return self._surface
 
     @surface.deleter
     def surface(self):
+        self._surface = None
+
+    def set_interim_filter(self, name=None):
+        """Use a different filter when scaling the pattern
+
+        While an image is being resized continuously (e.g. animated) a cheaper
+        filter such as "bilinear" can be used, with the difference rarely
+        being visible. Call again with no name to go back to the default
+        "best" filter once the size has settled. Valid names are "fast",
+        "good", "best", "nearest" and "bilinear".
+        """
+        if name is None:
+            self._filter = _FILTER_BEST
+            return
         try:
-            del self._surface
-        except AttributeError:
-            pass
+            self._filter = _FILTERS[name]
+        except KeyError:
+            raise ValueError("Unknown filter: {}".format(name))
 
     @property
     def pattern(self):
+        cache = self._pattern_cache
+        key = (self.width, self.height, round(self.theta, 3), self._filter)
         try:
-            return self._pattern
-        except AttributeError:
-            pat = get_cairo_pattern(self.surface, self.width, self.height, self.theta)
-            self._pattern = pat
+            cache.move_to_end(key)
+        except KeyError:
+            pat = get_cairo_pattern(
+                self.surface, self.width, self.height, self.theta, self._filter
+            )
+            cache[key] = pat
+            if len(cache) > self._PATTERN_CACHE_SIZE:
+                cache.popitem(last=False)
             return pat
+        return cache[key]
 
     @pattern.deleter
     def pattern(self):
-        try:
-            del self._pattern
-        except AttributeError:
-            pass
+        self._pattern_cache.clear()
 
     def __repr__(self):
         return "<{cls_name}: {name!r}, {width}x{height}@{theta:.1f}deg, {path!r}>".format(
@@ -297,12 +537,67 @@ class Img:
             theta=self.theta,
         )
 
+    @property
+    def _digest(self):
+        if self._surface_digest is None:
+            surf = self.default_surface
+            surf.flush()
+            self._surface_digest = hashlib.blake2b(surf.get_data(), digest_size=16).digest()
+        return self._surface_digest
+
+    def _identity(self):
+        return (self._digest, self.default_size, self.theta, self.width, self.height)
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        s0 = (self.bytes_img, self.theta, self.width, self.height)
-        s1 = (other.bytes_img, other.theta, other.width, other.height)
-        return s0 == s1
+        return self._identity() == other._identity()
+
+    def __hash__(self):
+        # Only the image itself is hashed, so resizing or rotating an Img that
+        # is used as a key doesn't change its hash
+        return hash((self._digest, self.default_size))
+
+
+def _index_directory(directory):
+    """Index the files found (recursively) in directory.
+
+    Returns two dicts mapping names to lists of paths: one keyed by full file
+    name and one keyed by every prefix of the file name that ends before a
+    ".". A lookup of ``name`` in the latter finds the same files as the glob
+    ``name.*``. Like glob, hidden files and directories are skipped.
+    """
+    files = defaultdict(list)
+    stems = defaultdict(list)
+    visited = set()
+    stack = [os.path.expanduser(directory)]
+    while stack:
+        dirpath = stack.pop()
+        realpath = os.path.realpath(dirpath)
+        if realpath in visited:
+            continue
+        visited.add(realpath)
+
+        subdirs = []
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                        continue
+                    files[name].append(entry.path)
+                    dot = name.find(".")
+                    while dot != -1:
+                        stems[name[:dot]].append(entry.path)
+                        dot = name.find(".", dot + 1)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+    return files, stems
 
 
 class Loader:
@@ -311,15 +606,32 @@ class Loader:
     load icons with Loader e.g.,
     >>> ldr = Loader('/usr/share/icons/Adwaita/24x24', '/usr/share/icons/Adwaita')
     >>> d_loaded_images = ldr('audio-volume-muted', 'audio-volume-low')
+
+    Names with an extension are first looked for directly in each directory.
+    Anything else is found using an index of the directory, built the first
+    time it is needed and reused by later calls. Call invalidate() if the
+    directories' contents change.
     """
 
     def __init__(self, *directories, **kwargs):
         for k, v in kwargs.items():
             setattr(self, k, v)
         self.directories = list(directories)
+        self._index = {}
+
+    def _directory_index(self, directory):
+        try:
+            return self._index[directory]
+        except KeyError:
+            index = self._index[directory] = _index_directory(directory)
+            return index
+
+    def invalidate(self):
+        """Drop the directory indexes so they are rebuilt when next needed"""
+        self._index = {}
 
     def __call__(self, *names):
-        d = {}
+        to_load = {}
         seen = set()
         set_names = set()
         for n in names:
@@ -330,14 +642,51 @@ class Loader:
                 set_names.add(n + ".*")
 
         for directory in self.directories:
-            d_matches = scan_files(directory, *(set_names - seen))
-            for name, paths in d_matches.items():
-                if paths:
-                    d[name if name in names else name[:-2]] = Img.from_path(paths[0])
-                    seen.add(name)
+            globs = []
+            lookups = []
+            for name in set_names - seen:
+                key = name if name in names else name[:-2]
+                if _GLOB_MAGIC.search(key) or os.sep in key:
+                    # Patterns and paths given by the caller still need a real glob
+                    globs.append(name)
+                elif key == name:
+                    path = os.path.join(os.path.expanduser(directory), key)
+                    if os.path.isfile(path):
+                        to_load[key] = path
+                        seen.add(name)
+                    else:
+                        lookups.append(name)
+                else:
+                    lookups.append(name)
+
+            if lookups:
+                files, stems = self._directory_index(directory)
+                for name in lookups:
+                    key = name if name in names else name[:-2]
+                    paths = files.get(key) if key == name else stems.get(key)
+                    if paths:
+                        to_load[key] = paths[0]
+                        seen.add(name)
+
+            if globs:
+                for name, paths in scan_files(directory, *globs).items():
+                    if paths:
+                        to_load[name if name in names else name[:-2]] = paths[0]
+                        seen.add(name)
 
         if seen != set_names:
             msg = "Wasn't able to find images corresponding to the names: {}"
             raise LoadingError(msg.format(set_names - seen))
 
+        if len(to_load) < 2:
+            return {name: Img.from_path(path) for name, path in to_load.items()}
+
+        # The pool is shut down before returning so that qtile isn't left with
+        # idle threads, which would make every later fork (e.g. spawn) unsafe.
+        workers = min(len(to_load), _MAX_LOADER_THREADS, os.cpu_count() or 1)
+        d = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qtile-images") as pool:
+            futures = {pool.submit(Img.from_path, path): name for name, path in to_load.items()}
+            for future in as_completed(futures):
+                d[futures[future]] = future.result()
         return d
@@ -22,6 +22,11 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import asyncio
+import itertools
+import time
+from collections import deque
+from types import MappingProxyType
 from typing import Any
 
 try:
@@ -34,12 +39,17 @@ except ImportError:
     has_dbus = False
 
 from libqtile.log_utils import logger
+from libqtile.utils import create_task
 
 BUS_NAME = "org.freedesktop.Notifications"
 SERVICE_PATH = "/org/freedesktop/Notifications"
 
 notifier: Any = None
 
+# Shared by all notifications sent without hints. It is read-only so anything
+# wanting to change a notification's hints must replace them with a copy.
+_EMPTY_HINTS: MappingProxyType = MappingProxyType({})
+
 
 class ClosedReason:
     expired = 1
@@ -54,16 +64,18 @@ if has_dbus:
             super().__init__(BUS_NAME)
             self.manager = manager
             self._capabilities = {"body"}
+            self._capabilities_list = list(self._capabilities)
 
         @method()
         def GetCapabilities(self) -> "as":  # type:ignore  # noqa: N802, F722
-            return list(self._capabilities)
+            return self._capabilities_list
 
         def register_capabilities(self, capabilities):
             if isinstance(capabilities, str):
                 self._capabilities.add(capabilities)
             elif isinstance(capabilities, (tuple, list, set)):
                 self._capabilities.update(set(capabilities))
+            self._capabilities_list = list(self._capabilities)
 
         @method()
         def Notify(  # noqa: N802, F722
@@ -103,6 +115,18 @@ if has_dbus:
             return ["qtile-notify-daemon", "qtile", "1.0", "1"]
 
     class Notification:
+        __slots__ = (
+            "summary",
+            "body",
+            "timeout",
+            "hints",
+            "app_name",
+            "replaces_id",
+            "app_icon",
+            "actions",
+            "id",
+        )
+
         def __init__(
             self,
             summary,
@@ -117,15 +141,23 @@ if has_dbus:
             self.summary = summary
             self.body = body
             self.timeout = timeout
-            self.hints = hints or {}
+            self.hints = hints if hints else _EMPTY_HINTS
             self.app_name = app_name
             self.replaces_id = replaces_id
             self.app_icon = app_icon
             self.actions = actions
 
     class NotificationManager:
+        # Number of past notifications kept in self.notifications
+        history_length = 256
+
+        # Synchronous callbacks taking longer than this (in seconds) hold up the
+        # reply to the dbus call and get logged
+        slow_callback_duration = 0.1
+
         def __init__(self):
-            self.notifications = []
+            self.notifications = deque(maxlen=self.history_length)
+            self._ids = itertools.count(1)
             self.callbacks = []
             self.close_callbacks = []
             self._service = None
@@ -192,25 +224,56 @@ if has_dbus:
                 except ValueError:
                     logger.error("Unable to remove notify on_close callback. Unknown callback.")
 
-        def add(self, notif):
-            self.notifications.append(notif)
-            notif.id = len(self.notifications)
-            for callback in self.callbacks:
+        async def _call_async(self, callback, arg, kind):
+            try:
+                await callback(arg)
+            except Exception:
+                logger.exception("Exception in notifier %s", kind)
+
+        def _run_callbacks(self, callbacks, arg, kind):
+            """
+            Run the callbacks with the given argument. Coroutine functions are
+            scheduled as tasks so they can't hold up the dbus reply.
+            """
+            for callback in callbacks:
+                if asyncio.iscoroutinefunction(callback):
+                    try:
+                        asyncio.get_running_loop()
+                    except RuntimeError:
+                        logger.error(
+                            "Unable to run notifier %s %s: no running event loop.",
+                            kind,
+                            getattr(callback, "__name__", callback),
+                        )
+                        continue
+                    create_task(self._call_async(callback, arg, kind))
+                    continue
+
+                start = time.monotonic()
                 try:
-                    callback(notif)
+                    callback(arg)
                 except Exception:
-                    logger.exception("Exception in notifier callback")
-            return len(self.notifications)
+                    logger.exception("Exception in notifier %s", kind)
+                duration = time.monotonic() - start
+                if duration > self.slow_callback_duration:
+                    logger.warning(
+                        "Notifier %s %s took %.3f seconds. Consider making it a coroutine.",
+                        kind,
+                        getattr(callback, "__name__", callback),
+                        duration,
+                    )
+
+        def add(self, notif):
+            notif.id = next(self._ids)
+            self.notifications.append(notif)
+            self._run_callbacks(self.callbacks, notif, "callback")
+            return notif.id
 
         def show(self, *args, **kwargs):
             notif = Notification(*args, **kwargs)
             return (notif, self.add(notif))
 
         def close(self, nid):
-            for callback in self.close_callbacks:
-                try:
-                    callback(nid)
-                except Exception:
-                    logger.exception("Exception in notifier close callback")
+            self._run_callbacks(self.close_callbacks, nid, "close callback")
 
     notifier = NotificationManager()
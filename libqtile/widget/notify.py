@@ -73,6 +73,7 @@ class Notify(base._TextBox):
     def __init__(self, width=bar.CALCULATED, **config):
         base._TextBox.__init__(self, "", width, **config)
         self.add_defaults(Notify.defaults)
+        # Id of the notification being displayed
         self.current_id = 0
 
         default_callbacks = {
@@ -141,7 +142,7 @@ class Notify(base._TextBox):
 
     def real_update(self, notif):
         self.set_notif_text(notif)
-        self.current_id = notif.id - 1
+        self.current_id = notif.id
         if notif.timeout and notif.timeout > 0:
             self.timeout_add(
                 notif.timeout / 1000, self.clear, method_args=(ClosedReason.expired,)
@@ -161,12 +162,23 @@ class Notify(base._TextBox):
         self.bar.draw()
         return True
 
+    def _current_notification(self):
+        """Return the notification being displayed, if it is still in the history"""
+        if notifier is None or not notifier.notifications:
+            return None
+        # Ids are consecutive so this is the notification's index in the history
+        index = self.current_id - notifier.notifications[0].id
+        if 0 <= index < len(notifier.notifications):
+            return notifier.notifications[index]
+        return None
+
     @expose_command()
     def display(self):
-        if notifier is None:
+        notif = self._current_notification()
+        if notif is None:
             return
 
-        self.set_notif_text(notifier.notifications[self.current_id])
+        self.set_notif_text(notif)
         self.bar.draw()
 
     @expose_command()
@@ -175,38 +187,42 @@ class Notify(base._TextBox):
         if notifier is None:
             return
 
-        notifier._service.NotificationClosed(notifier.notifications[self.current_id].id, reason)
+        notif = self._current_notification()
+        if notif is not None:
+            notifier._service.NotificationClosed(notif.id, reason)
         self.text = ""
         self.background = self.background_normal
-        self.current_id = len(notifier.notifications) - 1
+        if notifier.notifications:
+            self.current_id = notifier.notifications[-1].id
         self.bar.draw()
 
     def on_close(self, nid):
-        if self.current_id < len(notifier.notifications):
-            notif = notifier.notifications[self.current_id]
-            if notif.id == nid:
-                self.clear(ClosedReason.method)
+        notif = self._current_notification()
+        if notif is not None and notif.id == nid:
+            self.clear(ClosedReason.method)
 
     @expose_command()
     def prev(self):
         """Show previous notification."""
-        if self.current_id > 0:
-            self.current_id -= 1
+        if notifier is None or not notifier.notifications:
+            return
+
+        self.current_id = max(self.current_id - 1, notifier.notifications[0].id)
         self.display()
 
     @expose_command()
     def next(self):
-        if notifier is None:
+        """Show next notification."""
+        if notifier is None or not notifier.notifications:
             return
 
-        """Show next notification."""
-        if self.current_id < len(notifier.notifications) - 1:
-            self.current_id += 1
+        if self.current_id < notifier.notifications[-1].id:
+            self.current_id = max(self.current_id + 1, notifier.notifications[0].id)
             self.display()
 
     def _invoke(self):
-        if self.current_id < len(notifier.notifications):
-            notif = notifier.notifications[self.current_id]
+        notif = self._current_notification()
+        if notif is not None:
             if notif.actions:
                 notifier._service.ActionInvoked(notif.id, notif.actions[0])
             self.clear()
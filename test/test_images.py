@@ -2,7 +2,10 @@
 test_images.py contains unittests for libqtile.images.Img
 and its supporting code.
 """
+import math
 import os
+import shutil
+import threading
 from glob import glob
 from os import path
 
@@ -83,6 +86,74 @@ class TestImg:
         img2.theta = 0.0
         assert img == img2
 
+    def test_from_bytes(self, path_n_bytes_image):
+        path, bytes_image = path_n_bytes_image
+        img = images.Img.from_bytes(bytes_image)
+        assert isinstance(img.surface, cairocffi.ImageSurface)
+        assert img == images.Img(bytes_image)
+        assert img == images.Img.from_path(path)
+
+    def test_raster_bytes_dropped(self, path_n_bytes_image):
+        path, bytes_image = path_n_bytes_image
+        img = images.Img.from_path(path)
+        if path.endswith(".svg"):
+            assert img.bytes_img == bytes_image
+        else:
+            assert img.bytes_img is None
+
+    def test_from_path_cached(self, tmp_path):
+        fpath = tmp_path / "icon.png"
+        shutil.copy(PNGS[0], fpath)
+        img = images.Img.from_path(str(fpath))
+        img2 = images.Img.from_path(str(fpath))
+        assert img.default_surface is img2.default_surface
+        stat = os.stat(fpath)
+        os.utime(fpath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        img3 = images.Img.from_path(str(fpath))
+        assert img3.default_surface is not img.default_surface
+        assert img3 == img
+
+    def test_from_path_cache_bounded(self, tmp_path, monkeypatch):
+        cache = images._DecodeCache(max_bytes=0, max_entry=0)
+        monkeypatch.setattr(images, "_decode_cache", cache)
+        fpath = tmp_path / "icon.png"
+        shutil.copy(PNGS[0], fpath)
+        img = images.Img.from_path(str(fpath))
+        img2 = images.Img.from_path(str(fpath))
+        assert img.default_surface is not img2.default_surface
+
+    def test_from_raw(self):
+        width, height = 3, 2
+        stride = cairocffi.ImageSurface.format_stride_for_width(cairocffi.FORMAT_ARGB32, width)
+        buf = bytearray(range(stride * height))
+        img = images.Img.from_raw(buf, width, height)
+        assert img.default_size == (width, height)
+        assert img.bytes_img is None
+        assert bytes(img.default_surface.get_data()) == bytes(buf)
+        assert isinstance(img.pattern, cairocffi.SurfacePattern)
+
+    def test_from_raw_wide_items(self):
+        width, height = 3, 2
+        buf = memoryview(bytearray(range(width * height * 4))).cast("I")
+        img = images.Img.from_raw(buf, width, height)
+        assert img.default_size == (width, height)
+        assert bytes(img.default_surface.get_data()) == bytes(buf)
+
+    def test_from_raw_copies(self):
+        width, height = 3, 2
+        stride = cairocffi.ImageSurface.format_stride_for_width(cairocffi.FORMAT_ARGB32, width)
+        rows = [bytes([y]) * width * 4 for y in range(height)]
+        padded = b"".join(r + b"\xff" * 4 for r in rows)
+        img = images.Img.from_raw(padded, width, height, stride=width * 4 + 4)
+        data = bytes(img.default_surface.get_data())
+        assert [data[y * stride : y * stride + width * 4] for y in range(height)] == rows
+
+    def test_from_raw_bad_input(self):
+        with pytest.raises(ValueError):
+            images.Img.from_raw(bytearray(16), 2, 2, fmt="RGBA")
+        with pytest.raises(ValueError):
+            images.Img.from_raw(bytearray(8), 2, 2)
+
     def test_setting(self, png_img):
         img = png_img
         width0, height0 = img.default_size
@@ -102,6 +173,30 @@ class TestImg:
         assert img.pattern != pat2
         assert img.theta == pytest.approx(-35.0)
 
+    def test_pattern_cache(self, png_img):
+        img = png_img
+        width0, height0 = img.default_size
+        pat0 = img.pattern
+        img.width = width0 + 3
+        pat1 = img.pattern
+        assert pat1 is not pat0
+        img.width = width0
+        assert img.pattern is pat0
+        img.width = width0 + 3
+        assert img.pattern is pat1
+        del img.pattern
+        assert img.pattern is not pat1
+
+    def test_interim_filter(self, png_img):
+        pat0 = png_img.pattern
+        assert pat0.get_filter() == cairocffi.FILTER_BEST
+        png_img.set_interim_filter("bilinear")
+        assert png_img.pattern.get_filter() == cairocffi.FILTER_BILINEAR
+        png_img.set_interim_filter()
+        assert png_img.pattern is pat0
+        with pytest.raises(ValueError):
+            png_img.set_interim_filter("blurry")
+
     def test_equality(self, png_img):
         width0, height0 = png_img.default_size
         png_img2 = images.Img.from_path(png_img.path)
@@ -110,12 +205,30 @@ class TestImg:
         png_img2.height = width0 * 2
         assert png_img != png_img2
 
+    def test_hash(self, png_img):
+        png_img2 = images.Img.from_path(png_img.path)
+        assert hash(png_img) == hash(png_img2)
+        assert len({png_img, png_img2}) == 1
+        images_set = {png_img}
+        png_img.resize(width=png_img.default_size.width * 2)
+        png_img.theta = 45.0
+        assert png_img in images_set
+
     def test_setting_negative_size(self, png_img):
         png_img.width = -90
         assert png_img.width == 1
         png_img.height = 0
         assert png_img.height == 1
 
+    def test_delete_size(self, png_img):
+        width0, height0 = png_img.default_size
+        png_img.width = width0 + 5
+        png_img.height = height0 + 5
+        del png_img.width
+        del png_img.height
+        assert png_img.width == width0
+        assert png_img.height == height0
+
     def test_pattern(self, path_n_bytes_image):
         path, bytes_image = path_n_bytes_image
         img = images.Img(bytes_image)
@@ -134,6 +247,12 @@ class TestImg:
         t_matrix = img.pattern.get_matrix().as_tuple()
         assert_approx_equal(t_matrix, (0.5, 0.0, 0.0, 1.0 / 3.0))
 
+    def test_raster_resize_keeps_surface(self, png_img):
+        surface = png_img.surface
+        assert surface is png_img.default_surface
+        png_img.resize(width=3 * png_img.default_size.width)
+        assert png_img.surface is surface
+
     def test_pattern_rotate(self, path_n_bytes_image):
         path, bytes_image = path_n_bytes_image
         img = images.Img(bytes_image)
@@ -150,6 +269,26 @@ class TestImg:
         del img.theta
         assert img.theta == pytest.approx(0.0)
 
+    def test_pattern_rotate_scaled(self, png_img):
+        width0, height0 = png_img.default_size
+        png_img.width = 2 * width0
+        png_img.height = 3 * height0
+        png_img.theta = 30.0
+
+        # The matrix is composed by hand, check it against cairo's own composition
+        tr_width, tr_height = 0.5, 1.0 / 3.0
+        xt, yt = width0 * tr_width * 0.5, height0 * tr_height * 0.5
+        expected = cairocffi.Matrix()
+        expected.scale(tr_width, tr_height)
+        mat_rot = cairocffi.Matrix()
+        mat_rot.translate(xt, yt)
+        mat_rot.rotate(math.radians(30.0))
+        mat_rot.translate(-xt, -yt)
+        expected = mat_rot.multiply(expected)
+
+        t_matrix = png_img.pattern.get_matrix().as_tuple()
+        assert_approx_equal(t_matrix, expected.as_tuple())
+
 
 class TestImgScale:
     def test_scale(self, png_img):
@@ -229,3 +368,33 @@ class TestLoader:
         names = ("audio-asdlfjasdvolume-muted", "audio-volume-muted")
         with pytest.raises(images.LoadingError):
             loader(*names)
+
+    def test_no_threads_left(self, loader):
+        names = ("audio-volume-muted", "audio-volume-low")
+        before = {t.name for t in threading.enumerate()}
+        assert set(loader(*names)) == set(names)
+        assert {t.name for t in threading.enumerate()} == before
+
+    def test_name_with_directory(self):
+        loader = images.Loader(DATA_DIR)
+        name = path.join("png", "audio-volume-muted")
+        result = loader(name)
+        assert result[name].path == path.join(DATA_DIR, "png", "audio-volume-muted.png")
+
+    def test_exact_name_skips_index(self):
+        loader = images.Loader(path.join(DATA_DIR, "png"))
+        name = "audio-volume-muted.png"
+        assert loader(name)[name].path.endswith(name)
+        assert not loader._index
+
+    def test_index_reused(self, tmp_path):
+        subdir = tmp_path / "sub"
+        subdir.mkdir()
+        shutil.copy(PNGS[0], subdir / "first.png")
+        loader = images.Loader(str(tmp_path))
+        assert loader("first")["first"].path == str(subdir / "first.png")
+        shutil.copy(PNGS[0], tmp_path / "second.png")
+        with pytest.raises(images.LoadingError):
+            loader("second")
+        loader.invalidate()
+        assert loader("second")["second"].path == str(tmp_path / "second.png")
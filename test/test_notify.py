@@ -0,0 +1,93 @@
+# Tests for the NotificationManager in libqtile/notify.py. The dbus service
+# itself is exercised by test/widgets/test_notify.py.
+import asyncio
+import warnings
+
+import pytest
+
+from libqtile import notify
+
+pytestmark = pytest.mark.skipif(not notify.has_dbus, reason="dbus-next is not installed")
+
+
+@pytest.fixture
+def manager():
+    return notify.NotificationManager()
+
+
+def test_ids_are_consecutive(manager):
+    ids = [manager.show("Summary {}".format(i))[1] for i in range(3)]
+    assert ids == [1, 2, 3]
+    assert [n.id for n in manager.notifications] == ids
+
+
+def test_history_is_bounded(manager):
+    limit = manager.history_length
+    for i in range(limit + 10):
+        manager.show("Summary {}".format(i))
+    assert len(manager.notifications) == limit
+    assert manager.notifications[0].id == 11
+    assert manager.notifications[-1].id == limit + 10
+
+
+def test_empty_hints():
+    notif = notify.Notification("Summary")
+    assert notif.hints.get("urgency") is None
+    with pytest.raises(TypeError):
+        notif.hints["urgency"] = 2
+    hints = {"urgency": 2}
+    assert notify.Notification("Summary", hints=hints).hints is hints
+
+
+def test_callbacks(manager):
+    received = []
+    closed = []
+
+    async def async_callback(notif):
+        received.append(("async", notif.id))
+
+    async def run():
+        manager.callbacks.append(lambda notif: received.append(("sync", notif.id)))
+        manager.callbacks.append(async_callback)
+        manager.close_callbacks.append(closed.append)
+        nid = manager.show("Summary")[1]
+        # The synchronous callback has already run, the coroutine is only scheduled
+        assert received == [("sync", nid)]
+        manager.close(nid)
+        await asyncio.sleep(0)
+        return nid
+
+    nid = asyncio.run(run())
+    assert received == [("sync", nid), ("async", nid)]
+    assert closed == [nid]
+
+
+def test_callback_exceptions_are_logged(manager, caplog):
+    def bad_callback(notif):
+        raise ValueError
+
+    async def bad_async_callback(notif):
+        raise ValueError
+
+    async def run():
+        manager.callbacks.extend([bad_callback, bad_async_callback])
+        manager.show("Summary")
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert caplog.text.count("Exception in notifier callback") == 2
+
+
+def test_async_callback_without_loop(manager, caplog):
+    received = []
+
+    async def async_callback(notif):
+        received.append(notif.id)
+
+    manager.callbacks.append(async_callback)
+    manager.callbacks.append(lambda notif: received.append(notif.id))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        nid = manager.show("Summary")[1]
+    assert received == [nid]
+    assert "no running event loop" in caplog.text